@@ -9,7 +9,9 @@ from typing import List, Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from collections import deque
 
-from .scene_manager import SceneManager
+import numpy as np
+
+from .scene_manager import SceneManager, count_active_leds
 from .led_output import LEDOutput
 from .osc_handler import OSCHandler
 from config.settings import EngineSettings
@@ -145,6 +147,7 @@ class AnimationEngine:
             
         await self.osc_handler.stop()
         await self.led_output.stop()
+        await self.scene_manager.stop()
         
         logger.info("Animation Engine stopped.")
     
@@ -244,7 +247,7 @@ class AnimationEngine:
             stats_copy.frame_count = self.frame_count
             
             led_colors = self.scene_manager.get_led_output()
-            active_leds = sum(1 for color in led_colors if any(c > 0 for c in color[:3]))
+            active_leds = count_active_leds(led_colors)
             stats_copy.active_leds = active_leds
             stats_copy.total_leds = self.stats.total_leds
             
@@ -273,10 +276,7 @@ class AnimationEngine:
             
             if master_brightness < 255:
                 brightness_factor = master_brightness / 255.0
-                led_colors = [
-                    [int(c * brightness_factor) for c in color]
-                    for color in led_colors
-                ]
+                led_colors = (led_colors * brightness_factor).astype(np.uint8)
             
             self.led_output.send_led_data(led_colors)
                 
@@ -333,15 +333,8 @@ class AnimationEngine:
             success = False
             
             try:
-                with self._lock:
-                    if "multiple" in file_path.lower() or "scenes" in file_path.lower():
-                        success = self.scene_manager.load_multiple_scenes_from_file(file_path)
-                    else:
-                        success = self.scene_manager.load_scene_from_file(file_path)
-                        
-                    if not success:
-                        success = self.scene_manager.load_multiple_scenes_from_file(file_path)
-                        
+                success = self.scene_manager.load_from_file(file_path)
+                    
                 if success:
                     self._notify_state_change()
                         
@@ -540,7 +533,7 @@ class AnimationEngine:
         except Exception as e:
             logger.error(f"Error in handle_pattern_transition_config: {e}")
     
-    def get_led_colors(self) -> List[List[int]]:
+    def get_led_colors(self) -> np.ndarray:
         """
         Get the current LED colors for display
         """
@@ -548,9 +541,6 @@ class AnimationEngine:
         
         if self.master_brightness < 255:
             brightness_factor = self.master_brightness / 255.0
-            led_colors = [
-                [int(c * brightness_factor) for c in color]
-                for color in led_colors
-            ]
+            led_colors = (led_colors * brightness_factor).astype(np.uint8)
         
         return led_colors
\ No newline at end of file
@@ -6,6 +6,7 @@ import struct
 import time
 import threading
 from typing import List
+import numpy as np
 from pythonosc import udp_client
 
 from config.settings import EngineSettings
@@ -33,6 +34,7 @@ class LEDOutput:
         self.actual_send_fps = 0.0
         
         self._lock = threading.Lock()
+        self._wire_buf = np.zeros((EngineSettings.ANIMATION.led_count, 4), dtype=np.uint8)
         
     async def start(self):
         """
@@ -89,7 +91,7 @@ class LEDOutput:
         """
         Send LED serial array via OSC to all destinations
         """
-        if not self.output_enabled or not led_colors:
+        if not self.output_enabled or len(led_colors) == 0:
             return
         
         current_time = time.time()
@@ -137,24 +139,46 @@ class LEDOutput:
         Convert LED colors to binary serial format - OPTIMIZED
         """
         try:
-            binary_data = bytearray()
+            try:
+                colors = np.asarray(led_colors)
+            except ValueError:
+                return self._convert_rows_to_binary(led_colors)
             
-            for color in led_colors:
-                if len(color) >= 3:
-                    r = max(0, min(255, int(color[0])))
-                    g = max(0, min(255, int(color[1])))
-                    b = max(0, min(255, int(color[2])))
-                else:
-                    r = g = b = 0
-                
-                binary_data.extend(struct.pack("BBBB", r, g, b, 0))
+            if colors.ndim != 2 or colors.shape[1] < 3:
+                return self._convert_rows_to_binary(led_colors)
+            
+            if colors.dtype != np.uint8:
+                colors = np.clip(colors[:, :3], 0, 255)
             
-            return bytes(binary_data)
+            wire = self._wire_buf
+            if len(wire) != len(colors):
+                wire = self._wire_buf = np.zeros((len(colors), 4), dtype=np.uint8)
+            
+            wire[:, :3] = colors[:, :3]
+            return wire.tobytes()
             
         except Exception as e:
             logger.error(f"Error converting LED data to binary: {e}")
             return b""
     
+    def _convert_rows_to_binary(self, led_colors: List[List[int]]) -> bytes:
+        """
+        Convert irregular LED color rows one by one
+        """
+        binary_data = bytearray()
+        
+        for color in led_colors:
+            if len(color) >= 3:
+                r = max(0, min(255, int(color[0])))
+                g = max(0, min(255, int(color[1])))
+                b = max(0, min(255, int(color[2])))
+            else:
+                r = g = b = 0
+            
+            binary_data.extend(struct.pack("BBBB", r, g, b, 0))
+        
+        return bytes(binary_data)
+    
     def send_to_specific_device(self, device_index: int, led_colors: List[List[int]]):
         """
         Send LED data to specific device
@@ -163,7 +187,8 @@ class LEDOutput:
             client_info = self.clients[device_index]
             if client_info["client"]:
                 try:
-                    binary_data = self._convert_to_binary(led_colors)
+                    with self._lock:
+                        binary_data = self._convert_to_binary(led_colors)
                     client_info["client"].send_message(
                         EngineSettings.OSC.output_address,
                         binary_data
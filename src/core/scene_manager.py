@@ -1,10 +1,24 @@
+import os
+import mmap
+import asyncio
 import time
+import logging
 import threading
-import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    orjson = None
+    _json_loads = json.loads
 
 from src.models.scene import Scene
 from config.settings import EngineSettings
@@ -12,6 +26,96 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_READ_BUFFER_SIZE = 65536
+_DEBUG_LOG_INTERVAL = 10.0
+_ZERO_OUTPUT_CACHE: Optional[np.ndarray] = None
+
+
+def _open_scene_file(file_path: str) -> int:
+    """
+    Open a scene file for one sequential pass, hinting the kernel where supported.
+    """
+    flags = os.O_RDONLY | getattr(os, "O_NOATIME", 0)
+    try:
+        fd = os.open(file_path, flags)
+    except PermissionError:
+        fd = os.open(file_path, os.O_RDONLY)
+    
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+    
+    return fd
+
+
+def _read_scene_file(file_path: str) -> bytes:
+    """
+    Read a scene file into memory through a 64 KB buffer.
+    """
+    with os.fdopen(_open_scene_file(file_path), 'rb', buffering=_READ_BUFFER_SIZE) as f:
+        return f.read()
+
+
+def _load_scene_json(file_path: str) -> Any:
+    """
+    Parse a scene file, letting orjson read a memory mapping in place instead of a copied buffer.
+    """
+    if orjson is None:
+        return _json_loads(_read_scene_file(file_path))
+    
+    with os.fdopen(_open_scene_file(file_path), 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _json_loads(b"")
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+
+def _build_scene(scene_data: Dict[str, Any]) -> Any:
+    """
+    Build one scene, returning the exception instead of raising so failures are reported per scene.
+    """
+    try:
+        return Scene.from_dict(scene_data)
+    except Exception as e:
+        return e
+
+
+def _build_scenes(scenes_data: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Build scenes in order, consuming the list: each raw scene dict is dropped as soon as its scene is built.
+    """
+    results = []
+    for index, scene_data in enumerate(scenes_data):
+        results.append(_build_scene(scene_data))
+        scenes_data[index] = None
+    scenes_data.clear()
+    return results
+
+
+def _zero_output(led_count: int) -> np.ndarray:
+    """
+    Get the shared read-only all-black frame, rebuilt only when the LED count changes.
+    """
+    global _ZERO_OUTPUT_CACHE
+    if _ZERO_OUTPUT_CACHE is None or len(_ZERO_OUTPUT_CACHE) != led_count:
+        _ZERO_OUTPUT_CACHE = np.zeros((led_count, 3), dtype=np.uint8)
+        _ZERO_OUTPUT_CACHE.setflags(write=False)
+    return _ZERO_OUTPUT_CACHE
+
+
+def count_active_leds(led_output) -> int:
+    """
+    Count LEDs with any non-zero channel.
+    """
+    if len(led_output) == 0:
+        return 0
+    return int(np.count_nonzero(np.any(np.asarray(led_output)[:, :3], axis=1)))
+
 
 class TransitionPhase(Enum):
     FADE_OUT = "fade_out"
@@ -50,11 +154,28 @@ class SceneManager:
     def __init__(self):
         self.scenes: Dict[int, Scene] = {}
         self.active_scene_id: Optional[int] = None
+        self._scene_ids: tuple = ()
+        self._active_scene: Optional[Scene] = None
+        self._active_effects: List[Any] = []
+        self._effects_moving = False
+        self._effects_dirty = True
         self.last_update_time = time.time()
+        self._led_count = EngineSettings.ANIMATION.led_count
+        self._target_fps = EngineSettings.ANIMATION.target_fps
+        self._transitions_enabled = EngineSettings.PATTERN_TRANSITION.enabled
+        self._min_step = 1.0 / max(self._target_fps * 4, 240)
+        self._dt_accum = 0.0
         
-        self._lock = threading.RLock()
-        self._debug_frame_count = 0
+        self._lock = threading.Lock()
+        self._debug_task: Optional[asyncio.Task] = None
+        self._frame_version = 0
+        self._led_cache: Optional[tuple] = None
+        self._info_snapshot: Optional[Dict[str, Any]] = None
+        self._scenes_snapshot: Optional[Dict[int, str]] = None
         self._change_callbacks: List[callable] = []
+        self._notify_lock = threading.Lock()
+        self._notify_pool: Optional[ThreadPoolExecutor] = None
+        self._notify_pending = False
         
         self.pattern_transition = PatternTransition()
         self.transition_config = PatternTransitionConfig(
@@ -65,14 +186,74 @@ class SceneManager:
     
     async def initialize(self):
         logger.info("Initializing Scene Manager...")    
+        self._debug_task = asyncio.create_task(self._debug_loop())
         logger.info("Scene Manager is ready - waiting for OSC signal to load scenes.")
     
+    async def stop(self):
+        if self._debug_task:
+            self._debug_task.cancel()
+            self._debug_task = None
+        
+        with self._notify_lock:
+            pool, self._notify_pool = self._notify_pool, None
+            self._notify_pending = False
+        if pool is not None:
+            pool.shutdown(wait=False)
+        logger.info("Scene Manager notifier stopped.")
+    
+    async def _debug_loop(self):
+        while True:
+            await asyncio.sleep(_DEBUG_LOG_INTERVAL)
+            if logger.isEnabledFor(logging.DEBUG):
+                with self._lock:
+                    self._log_animation_debug_info()
+    
+    def _refresh_scene_ids(self):
+        self._scene_ids = tuple(self.scenes)
+    
+    def _rebuild_effects(self):
+        scene = self._active_scene
+        self._active_effects = list(scene.effects.values()) if scene is not None else []
+        self._effects_moving = any(
+            abs(segment.move_speed) >= 0.001
+            for effect in self._active_effects
+            for segment in effect.segments.values()
+        )
+        self._effects_dirty = False
+    
+    def _refresh_active_scene(self):
+        self._active_scene = self.scenes.get(self.active_scene_id) if self.active_scene_id else None
+        self._effects_dirty = True
+    
+    def _invalidate_caches(self):
+        self._led_cache = None
+        self._info_snapshot = None
+        self._scenes_snapshot = None
+    
     def add_change_callback(self, callback: callable):
         with self._lock:
             self._change_callbacks.append(callback)
             
     def _notify_changes(self):
-        for callback in self._change_callbacks:
+        if self._notify_pending or not self._change_callbacks:
+            return
+        
+        with self._notify_lock:
+            if self._notify_pending:
+                return
+            # Created on demand so notifications resume after stop().
+            if self._notify_pool is None:
+                self._notify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-notify")
+            
+            self._notify_pending = True
+            try:
+                self._notify_pool.submit(self._flush_changes)
+            except RuntimeError:
+                self._notify_pending = False
+    
+    def _flush_changes(self):
+        self._notify_pending = False
+        for callback in tuple(self._change_callbacks):
             try:
                 callback()
             except Exception as e:
@@ -91,33 +272,45 @@ class SceneManager:
     
     def start_pattern_transition(self, to_effect_id: int = None, to_palette_id: str = None):
         with self._lock:
-            if not self.active_scene_id or self.active_scene_id not in self.scenes:
-                return False
-            
-            current_scene = self.scenes[self.active_scene_id]
-            
-            self.pattern_transition.is_active = True
-            self.pattern_transition.phase = TransitionPhase.FADE_OUT
-            
-            self.pattern_transition.from_effect_id = current_scene.current_effect_id
-            self.pattern_transition.from_palette_id = current_scene.current_palette
-            self.pattern_transition.to_effect_id = to_effect_id or current_scene.current_effect_id
-            self.pattern_transition.to_palette_id = to_palette_id or current_scene.current_palette
-            
-            self.pattern_transition.fade_in_ms = self.transition_config.fade_in_ms
-            self.pattern_transition.fade_out_ms = self.transition_config.fade_out_ms
-            self.pattern_transition.waiting_ms = self.transition_config.waiting_ms
-            
-            self.pattern_transition.start_time = time.time()
-            self.pattern_transition.phase_start_time = time.time()
-            self.pattern_transition.progress = 0.0
-            
-            logger.info(f"Pattern transition started: Effect {self.pattern_transition.from_effect_id} → {self.pattern_transition.to_effect_id}, Palette {self.pattern_transition.from_palette_id} → {self.pattern_transition.to_palette_id}")
-            return True
+            return self._start_pattern_transition(to_effect_id, to_palette_id)
+    
+    def _start_pattern_transition(self, to_effect_id: int = None, to_palette_id: str = None):
+        if self._active_scene is None:
+            return False
+        
+        current_scene = self._active_scene
+        
+        shown_effect_id, shown_palette_id = self._shown_pattern(current_scene)
+        
+        self.pattern_transition.from_effect_id = shown_effect_id
+        self.pattern_transition.from_palette_id = shown_palette_id
+        self.pattern_transition.to_effect_id = to_effect_id or shown_effect_id
+        self.pattern_transition.to_palette_id = to_palette_id or shown_palette_id
+        
+        self.pattern_transition.is_active = True
+        self.pattern_transition.phase = TransitionPhase.FADE_OUT
+        
+        self.pattern_transition.fade_in_ms = self.transition_config.fade_in_ms
+        self.pattern_transition.fade_out_ms = self.transition_config.fade_out_ms
+        self.pattern_transition.waiting_ms = self.transition_config.waiting_ms
+        
+        now = time.monotonic()
+        self.pattern_transition.start_time = now
+        self.pattern_transition.phase_start_time = now
+        self.pattern_transition.progress = 0.0
+        self._invalidate_caches()
+        
+        logger.info(f"Pattern transition started: Effect {self.pattern_transition.from_effect_id} → {self.pattern_transition.to_effect_id}, Palette {self.pattern_transition.from_palette_id} → {self.pattern_transition.to_palette_id}")
+        return True
+    
+    def _shown_pattern(self, scene: Scene) -> Tuple[int, str]:
+        if self.pattern_transition.is_active and self.pattern_transition.phase == TransitionPhase.FADE_IN:
+            return self.pattern_transition.to_effect_id, self.pattern_transition.to_palette_id
+        return scene.current_effect_id, scene.current_palette
     
-    def _update_pattern_transition(self, current_time: float):
+    def _update_pattern_transition(self, current_time: float) -> bool:
         if not self.pattern_transition.is_active:
-            return
+            return False
             
         phase_elapsed = (current_time - self.pattern_transition.phase_start_time) * 1000
         
@@ -139,15 +332,17 @@ class SceneManager:
         
         elif self.pattern_transition.phase == TransitionPhase.FADE_IN:
             if phase_elapsed >= self.pattern_transition.fade_in_ms:
-                self._complete_pattern_transition()
+                return self._complete_pattern_transition()
             else:
                 self.pattern_transition.progress = phase_elapsed / self.pattern_transition.fade_in_ms
+        
+        return False
     
-    def _complete_pattern_transition(self):
-        if not self.active_scene_id or self.active_scene_id not in self.scenes:
-            return
+    def _complete_pattern_transition(self) -> bool:
+        if self._active_scene is None:
+            return False
             
-        scene = self.scenes[self.active_scene_id]
+        scene = self._active_scene
         scene.current_effect_id = self.pattern_transition.to_effect_id
         scene.current_palette = self.pattern_transition.to_palette_id
         
@@ -155,135 +350,196 @@ class SceneManager:
         self.pattern_transition.phase = TransitionPhase.COMPLETED
         
         logger.info(f"Pattern transition completed: Effect {self.pattern_transition.to_effect_id}, Palette {self.pattern_transition.to_palette_id}")
-        self._notify_changes()
+        self._invalidate_caches()
+        return True
     
-    def get_led_output(self) -> List[List[int]]:
+    def get_led_output(self) -> np.ndarray:
+        cache = self._led_cache
+        if cache is not None and cache[0] == (self.active_scene_id, self._frame_version):
+            return cache[1]
+        
         with self._lock:
-            if not self.pattern_transition.is_active:
-                if self.active_scene_id and self.active_scene_id in self.scenes:
-                    scene = self.scenes[self.active_scene_id]
-                    output = scene.get_led_output()
-                    return output
-                return [[0, 0, 0] for _ in range(EngineSettings.ANIMATION.led_count)]
-            
-            return self._get_transition_led_output()
+            return self._get_cached_led_output()
+    
+    def _render_led_output(self) -> np.ndarray:
+        cache_key = (self.active_scene_id, self._frame_version)
+        if not self.pattern_transition.is_active:
+            if self._active_scene is None:
+                return _zero_output(self._led_count)
+            scene = self._active_scene
+            output = scene.render(scene.current_effect_id, scene.current_palette)
+        else:
+            output = self._get_transition_led_output()
+        
+        # Each version gets its own array; publish it read-only since the lock-free path hands it out.
+        if output.flags.writeable:
+            output.setflags(write=False)
+        self._led_cache = (cache_key, output)
+        return output
+    
+    def _get_cached_led_output(self) -> np.ndarray:
+        cache = self._led_cache
+        if cache is not None and cache[0] == (self.active_scene_id, self._frame_version):
+            return cache[1]
+        return self._render_led_output()
     
-    def _get_transition_led_output(self) -> List[List[int]]:
-        if not self.active_scene_id or self.active_scene_id not in self.scenes:
-            return [[0, 0, 0] for _ in range(EngineSettings.ANIMATION.led_count)]
+    def _get_transition_led_output(self) -> np.ndarray:
+        if self._active_scene is None:
+            return _zero_output(self._led_count)
         
-        scene = self.scenes[self.active_scene_id]
+        scene = self._active_scene
         
         if self.pattern_transition.phase == TransitionPhase.FADE_OUT:
-            scene.current_effect_id = self.pattern_transition.from_effect_id
-            scene.current_palette = self.pattern_transition.from_palette_id
-            output = scene.get_led_output()
+            output = scene.render(self.pattern_transition.from_effect_id, self.pattern_transition.from_palette_id)
             
-            brightness = self.pattern_transition.progress
-            return [
-                [int(color[0] * brightness), int(color[1] * brightness), int(color[2] * brightness)]
-                for color in output
-            ]
+            if output.flags.writeable:
+                brightness = self.pattern_transition.progress
+                np.multiply(output, brightness, out=output, casting="unsafe")
+            return output
         
         elif self.pattern_transition.phase == TransitionPhase.WAITING:
-            return [[0, 0, 0] for _ in range(EngineSettings.ANIMATION.led_count)]
+            return _zero_output(self._led_count)
         
         elif self.pattern_transition.phase == TransitionPhase.FADE_IN:
-            scene.current_effect_id = self.pattern_transition.to_effect_id
-            scene.current_palette = self.pattern_transition.to_palette_id
-            output = scene.get_led_output()
+            output = scene.render(self.pattern_transition.to_effect_id, self.pattern_transition.to_palette_id)
             
-            brightness = self.pattern_transition.progress
-            return [
-                [int(color[0] * brightness), int(color[1] * brightness), int(color[2] * brightness)]
-                for color in output
-            ]
+            if output.flags.writeable:
+                brightness = self.pattern_transition.progress
+                np.multiply(output, brightness, out=output, casting="unsafe")
+            return output
         
-        return [[0, 0, 0] for _ in range(EngineSettings.ANIMATION.led_count)]
+        return _zero_output(self._led_count)
     
-    def load_scene_from_file(self, file_path: str) -> bool:
+    def load_from_file(self, file_path: str) -> bool:
         try:
-            with self._lock:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            data = _load_scene_json(file_path)
+            
+            if isinstance(data, dict) and "scenes" in data:
+                return self._load_scenes_data(data, file_path)
+            return self._load_single_scene_data(data, file_path)
                 
-                if "scene_ID" in data:
-                    scene = Scene.from_dict(data)
-                    self.scenes[scene.scene_id] = scene
-                    
-                    if self.active_scene_id is None:
-                        self.active_scene_id = scene.scene_id
-                    
-                    logger.info(f"Loaded single scene {scene.scene_id} from {file_path}")
-                    self._log_scene_debug_info()
-                    self._notify_changes()
-                    return True
-                else:
-                    logger.warning(f"File {file_path} does not contain scene_ID at root - not a standard single scene format")
-                    return False
+        except Exception as e:
+            logger.error(f"Error loading scenes from {file_path}: {e}")
+            return False
+    
+    def load_scene_from_file(self, file_path: str) -> bool:
+        try:
+            return self._load_single_scene_data(_load_scene_json(file_path), file_path)
                 
         except Exception as e:
             logger.error(f"Error loading single scene from {file_path}: {e}")
             return False
     
+    def _load_single_scene_data(self, data: Dict[str, Any], file_path: str) -> bool:
+        if "scene_ID" not in data:
+            logger.warning(f"File {file_path} does not contain scene_ID at root - not a standard single scene format")
+            return False
+        
+        scene = Scene.from_dict(data)
+        
+        with self._lock:
+            self.scenes[scene.scene_id] = scene
+            self._refresh_scene_ids()
+            self._effects_dirty = True
+            
+            if self.active_scene_id is None:
+                self.active_scene_id = scene.scene_id
+            self._refresh_active_scene()
+            
+            logger.info(f"Loaded single scene {scene.scene_id} from {file_path}")
+            self._log_scene_debug_info()
+            self._invalidate_caches()
+        
+        self._notify_changes()
+        return True
+    
+    def _parse_scenes_data(self, data: Dict[str, Any], file_path: str) -> Optional[Dict[int, Scene]]:
+        if "scenes" not in data:
+            logger.warning(f"File {file_path} does not contain 'scenes'")
+            return None
+        
+        scenes_data = data.pop("scenes") or []
+        if not scenes_data:
+            logger.warning(f"File {file_path} has empty 'scenes' array")
+            return None
+        
+        # Keep the valid entries by compacting the popped list in place, so _build_scenes
+        # consumes the only list that references the raw scene dicts.
+        valid_count = 0
+        
+        for scene_data in scenes_data:
+            try:
+                if "scene_ID" not in scene_data:
+                    logger.warning(f"Scene data missing scene_ID: {scene_data}")
+                    continue
+                scenes_data[valid_count] = scene_data
+                valid_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error loading individual scene: {e}")
+                continue
+        
+        del scenes_data[valid_count:]
+        new_scenes: Dict[int, Scene] = {}
+        
+        for result in _build_scenes(scenes_data):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading individual scene: {result}")
+                continue
+            new_scenes[result.scene_id] = result
+        
+        return new_scenes
+    
     def load_multiple_scenes_from_file(self, file_path: str) -> bool:
         try:
-            with self._lock:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                if "scenes" not in data:
-                    logger.warning(f"File {file_path} does not contain 'scenes'")
-                    return False
-                
-                scenes_data = data.get("scenes", [])
-                if not scenes_data:
-                    logger.warning(f"File {file_path} has empty 'scenes' array")
-                    return False
-                
-                loaded_count = 0
-                
-                for scene_data in scenes_data:
-                    try:
-                        if "scene_ID" not in scene_data:
-                            logger.warning(f"Scene data missing scene_ID: {scene_data}")
-                            continue
-                            
-                        scene = Scene.from_dict(scene_data)
-                        self.scenes[scene.scene_id] = scene
-                        loaded_count += 1
-                        
-                        if self.active_scene_id is None:
-                            self.active_scene_id = scene.scene_id
-                            
-                    except Exception as e:
-                        logger.error(f"Error loading individual scene: {e}")
-                        continue
-                
-                if loaded_count > 0:
-                    self._log_scene_debug_info()
-                    self._notify_changes()
-                    return True
-                else:
-                    logger.error(f"No valid scenes loaded from {file_path}")
-                    return False
+            return self._load_scenes_data(_load_scene_json(file_path), file_path)
                 
         except Exception as e:
             logger.error(f"Error loading multiple scenes from {file_path}: {e}")
             return False
     
+    def _load_scenes_data(self, data: Dict[str, Any], file_path: str) -> bool:
+        new_scenes = self._parse_scenes_data(data, file_path)
+        if new_scenes is None:
+            return False
+        
+        if not new_scenes:
+            logger.error(f"No valid scenes loaded from {file_path}")
+            return False
+        
+        with self._lock:
+            self.scenes.update(new_scenes)
+            
+            if self.active_scene_id is None:
+                self.active_scene_id = next(iter(new_scenes))
+            
+            self._refresh_scene_ids()
+            self._effects_dirty = True
+            self._refresh_active_scene()
+            self._log_scene_debug_info()
+            self._invalidate_caches()
+        
+        self._notify_changes()
+        return True
+    
     def load_scene(self, scene_data: Dict[str, Any]) -> bool:
         try:
+            scene = Scene.from_dict(scene_data)
+            
             with self._lock:
-                scene = Scene.from_dict(scene_data)
                 self.scenes[scene.scene_id] = scene
+                self._refresh_scene_ids()
+                self._effects_dirty = True
                 
                 if self.active_scene_id is None:
                     self.active_scene_id = scene.scene_id
+                self._refresh_active_scene()
                     
-                self._notify_changes()
-                logger.info(f"Scene {scene.scene_id} has been loaded successfully")
-                return True
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            logger.info(f"Scene {scene.scene_id} has been loaded successfully")
+            return True
                 
         except Exception as e:
             logger.error(f"Error loading scene: {e}")
@@ -293,18 +549,21 @@ class SceneManager:
         try:
             with self._lock:
                 if scene_id not in self.scenes:
-                    logger.warning(f"Scene {scene_id} does not exist. Available: {list(self.scenes.keys())}")
+                    logger.warning(f"Scene {scene_id} does not exist. Available: {self._scene_ids}")
                     return False
                     
                 self.active_scene_id = scene_id
+                self._refresh_active_scene()
                 
                 if fade_params:
-                    self.scenes[scene_id].fade_params = fade_params
+                    self._active_scene.fade_params = fade_params
                     
-                self._notify_changes()
+                self._invalidate_caches()
                 logger.info(f"Switched to scene {scene_id}")
                 self._log_scene_debug_info()
-                return True
+            
+            self._notify_changes()
+            return True
                 
         except Exception as e:
             logger.error(f"Error switching scene: {e}")
@@ -320,9 +579,11 @@ class SceneManager:
                 scene = self.scenes[scene_id]
                 scene.switch_effect(effect_id, palette_id)
                 
-                self._notify_changes()
-                logger.info(f"Scene {scene_id}: effect {effect_id}, palette {palette_id}")
-                return True
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            logger.info(f"Scene {scene_id}: effect {effect_id}, palette {palette_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error setting effect/palette: {e}")
@@ -331,23 +592,25 @@ class SceneManager:
     def set_effect(self, effect_id: int) -> bool:
         try:
             with self._lock:
-                if not self.active_scene_id or self.active_scene_id not in self.scenes:
+                if self._active_scene is None:
                     logger.warning("No active scene")
                     return False
                 
-                scene = self.scenes[self.active_scene_id]
-                if str(effect_id) not in scene.effects:
-                    logger.warning(f"Effect {effect_id} does not exist in scene {self.active_scene_id}. Available: {list(scene.effects.keys())}")
+                scene = self._active_scene
+                if effect_id not in scene.effects:
+                    logger.warning(f"Effect {effect_id} does not exist in scene {self.active_scene_id}. Available: {scene.get_effect_ids()}")
                     return False
                 
-                if EngineSettings.PATTERN_TRANSITION.enabled:
-                    return self.start_pattern_transition(to_effect_id=effect_id)
-                else:
-                    scene.current_effect_id = effect_id
-                    logger.info(f"Set effect {effect_id} for scene {self.active_scene_id}")
-                    self._log_scene_debug_info()
-                    self._notify_changes()
-                    return True
+                if self._transitions_enabled:
+                    return self._start_pattern_transition(to_effect_id=effect_id)
+                
+                scene.current_effect_id = effect_id
+                logger.info(f"Set effect {effect_id} for scene {self.active_scene_id}")
+                self._log_scene_debug_info()
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            return True
                 
         except Exception as e:
             logger.error(f"Error setting effect: {e}")
@@ -356,21 +619,23 @@ class SceneManager:
     def set_palette(self, palette_id: str) -> bool:
         try:
             with self._lock:
-                if not self.active_scene_id or self.active_scene_id not in self.scenes:
+                if self._active_scene is None:
                     return False
                 
-                scene = self.scenes[self.active_scene_id]
+                scene = self._active_scene
                 if palette_id not in scene.palettes:
-                    logger.warning(f"Palette {palette_id} does not exist in scene {self.active_scene_id}. Available: {list(scene.palettes.keys())}")
+                    logger.warning(f"Palette {palette_id} does not exist in scene {self.active_scene_id}. Available: {scene.get_palette_ids()}")
                     return False
                 
-                if EngineSettings.PATTERN_TRANSITION.enabled:
-                    return self.start_pattern_transition(to_palette_id=palette_id)
-                else:
-                    scene.current_palette = palette_id
-                    logger.info(f"Set palette {palette_id} for scene {self.active_scene_id}")
-                    self._notify_changes()
-                    return True
+                if self._transitions_enabled:
+                    return self._start_pattern_transition(to_palette_id=palette_id)
+                
+                scene.current_palette = palette_id
+                logger.info(f"Set palette {palette_id} for scene {self.active_scene_id}")
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            return True
                 
         except Exception as e:
             logger.error(f"Error setting palette: {e}")
@@ -385,14 +650,17 @@ class SceneManager:
                 scene = self.scenes[scene_id]
                 current_effect = scene.get_current_effect()
                 
-                if current_effect:
-                    for segment in current_effect.segments.values():
-                        segment.move_speed = speed if segment.move_speed >= 0 else -speed
-                        
-                    self._notify_changes()
-                    return True
+                if not current_effect:
+                    return False
+                
+                for segment in current_effect.segments.values():
+                    segment.move_speed = speed if segment.move_speed >= 0 else -speed
                     
-                return False
+                self._effects_dirty = True
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            return True
                 
         except Exception as e:
             logger.error(f"Error setting move speed: {e}")
@@ -400,20 +668,35 @@ class SceneManager:
     
     def update_palette_color(self, palette_id: str, color_id: int, rgb: List[int]) -> bool:
         try:
+            if len(rgb) < 3:
+                logger.warning(f"Palette color update needs 3 RGB values, got {len(rgb)}: {rgb}")
+                return False
+            
             with self._lock:
-                if not self.active_scene_id or self.active_scene_id not in self.scenes:
+                if self._active_scene is None:
                     return False
                 
-                scene = self.scenes[self.active_scene_id]
+                scene = self._active_scene
                 if palette_id not in scene.palettes:
                     return False
                 
-                if 0 <= color_id < len(scene.palettes[palette_id]):
-                    scene.palettes[palette_id][color_id] = rgb[:3]
-                    self._notify_changes()
-                    return True
+                palette = scene.palettes[palette_id]
+                if not 0 <= color_id < len(palette):
+                    return False
                 
-                return False
+                color = rgb[:3]
+                if isinstance(palette, np.ndarray) and all(0 <= c <= 255 for c in color):
+                    palette[color_id, :3] = color
+                else:
+                    if isinstance(palette, np.ndarray):
+                        # Out-of-range values do not fit the uint8 array; keep them as the loader does.
+                        palette = scene.palettes[palette_id] = palette.tolist()
+                    palette[color_id] = color
+                scene.invalidate_color_cache()
+                self._invalidate_caches()
+            
+            self._notify_changes()
+            return True
                 
         except Exception as e:
             logger.error(f"Error updating palette color: {e}")
@@ -425,89 +708,112 @@ class SceneManager:
         self.last_update_time = current_time
         
         with self._lock:
-            for scene in self.scenes.values():
-                for effect in scene.effects.values():
-                    effect.update_animation(delta_time)
+            if self._effects_dirty:
+                self._rebuild_effects()
+            
+            for effect in self._active_effects:
+                effect.update_animation(delta_time)
+            
+            self._frame_version += 1
+            self._led_cache = None
     
     def update_animation(self, delta_time: float):
         with self._lock:
-            current_time = time.time()
-            
-            self._update_pattern_transition(current_time)
+            transition_completed = False
+            if self.pattern_transition.is_active:
+                transition_completed = self._update_pattern_transition(time.monotonic())
+            frame_changed = transition_completed or self.pattern_transition.is_active
             
-            self._debug_frame_count += 1
+            self._dt_accum += delta_time
+            if self._dt_accum < self._min_step:
+                effects = ()
+            else:
+                delta_time = self._dt_accum
+                self._dt_accum = 0.0
+                
+                if self._effects_dirty:
+                    self._rebuild_effects()
+                effects = self._active_effects
+                frame_changed = frame_changed or self._effects_moving
             
-            if self._debug_frame_count % 600 == 0: 
-                self._log_animation_debug_info()
+            for effect in effects:
+                effect.update_animation(delta_time)
             
-            for scene in self.scenes.values():
-                for effect in scene.effects.values():
-                    effect.update_animation(delta_time)
+            if frame_changed:
+                self._frame_version += 1
+        
+        if transition_completed:
+            self._notify_changes()
     
     def _log_animation_debug_info(self):
-        if not self.active_scene_id or self.active_scene_id not in self.scenes:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        if self._active_scene is None:
             return
             
-        scene = self.scenes[self.active_scene_id]
+        scene = self._active_scene
         current_effect = scene.get_current_effect()
         
         if current_effect:
-            led_output = self.get_led_output()
-            active_count = sum(1 for color in led_output if any(c > 0 for c in color))
+            led_output = self._get_cached_led_output()
+            active_count = count_active_leds(led_output)
             
-            logger.info(f"Animation Frame {self._debug_frame_count}: Active LEDs = {active_count}/{len(led_output)}")
+            logger.debug(f"Animation frame version {self._frame_version}: Active LEDs = {active_count}/{len(led_output)}")
             
             if self.pattern_transition.is_active:
-                logger.info(f"Pattern Transition: {self.pattern_transition.phase.value}, Progress: {self.pattern_transition.progress:.2f}")
+                logger.debug(f"Pattern Transition: {self.pattern_transition.phase.value}, Progress: {self.pattern_transition.progress:.2f}")
             
             for seg_id, segment in current_effect.segments.items():
-                logger.info(f"  Segment {seg_id}: pos={segment.current_position:.1f}, speed={segment.move_speed}")
+                logger.debug(f"  Segment {seg_id}: pos={segment.current_position:.1f}, speed={segment.move_speed}")
     
     def _log_scene_debug_info(self):
-        logger.info(f"=== SCENE INFORMATION ===")
-        logger.info(f"Total scenes loaded: {len(self.scenes)}")
-        logger.info(f"Available scene IDs: {list(self.scenes.keys())}")
-        logger.info(f"Active Scene ID: {self.active_scene_id}")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug(f"=== SCENE INFORMATION ===")
+        logger.debug(f"Total scenes loaded: {len(self.scenes)}")
+        logger.debug(f"Available scene IDs: {self._scene_ids}")
+        logger.debug(f"Active Scene ID: {self.active_scene_id}")
         
-        if not self.active_scene_id or self.active_scene_id not in self.scenes:
+        if self._active_scene is None:
             logger.warning("No active scene or active scene not found!")
             return
             
-        scene = self.scenes[self.active_scene_id]
+        scene = self._active_scene
         current_effect = scene.get_current_effect()
         
-        logger.info(f"Scene {scene.scene_id}:")
-        logger.info(f"  - Effects: {len(scene.effects)} (IDs: {list(scene.effects.keys())})")
-        logger.info(f"  - Palettes: {len(scene.palettes)} (IDs: {list(scene.palettes.keys())})")
-        logger.info(f"  - Current Effect ID: {scene.current_effect_id}")
-        logger.info(f"  - Current Palette: {scene.current_palette}")
+        logger.debug(f"Scene {scene.scene_id}:")
+        logger.debug(f"  - Effects: {len(scene.effects)} (IDs: {scene.get_effect_ids()})")
+        logger.debug(f"  - Palettes: {len(scene.palettes)} (IDs: {scene.get_palette_ids()})")
+        logger.debug(f"  - Current Effect ID: {scene.current_effect_id}")
+        logger.debug(f"  - Current Palette: {scene.current_palette}")
         
         if current_effect:
-            logger.info(f"Current Effect {current_effect.effect_id}:")
-            logger.info(f"  - LED Count: {current_effect.led_count}")
-            logger.info(f"  - FPS: {current_effect.fps}")
-            logger.info(f"  - Segments: {len(current_effect.segments)} (IDs: {list(current_effect.segments.keys())})")
+            logger.debug(f"Current Effect {current_effect.effect_id}:")
+            logger.debug(f"  - LED Count: {current_effect.led_count}")
+            logger.debug(f"  - FPS: {current_effect.fps}")
+            logger.debug(f"  - Segments: {len(current_effect.segments)} (IDs: {list(current_effect.segments.keys())})")
             
             total_expected_leds = 0
             for seg_id, segment in current_effect.segments.items():
-                total_length = sum(segment.length) if segment.length else 0
-                has_color = any(c > 0 for c in segment.color) if segment.color else False
-                expected_leds = total_length if has_color else 0
+                total_length = segment.total_length
+                expected_leds = total_length if any(segment.color) else 0
                 total_expected_leds += expected_leds
                 
-                logger.info(f"  Segment {seg_id}:")
-                logger.info(f"    - Length: {segment.length} (total: {total_length})")
-                logger.info(f"    - Position: {segment.current_position:.1f} (initial: {segment.initial_position})")
-                logger.info(f"    - Speed: {segment.move_speed}")
-                logger.info(f"    - Colors: {segment.color}")
-                logger.info(f"    - Expected LEDs: {expected_leds}")
+                logger.debug(f"  Segment {seg_id}:")
+                logger.debug(f"    - Length: {segment.length} (total: {total_length})")
+                logger.debug(f"    - Position: {segment.current_position:.1f} (initial: {segment.initial_position})")
+                logger.debug(f"    - Speed: {segment.move_speed}")
+                logger.debug(f"    - Colors: {segment.color}")
+                logger.debug(f"    - Expected LEDs: {expected_leds}")
             
-            logger.info(f"  Total expected active LEDs: {total_expected_leds}")
+            logger.debug(f"  Total expected active LEDs: {total_expected_leds}")
             
             try:
                 led_output = scene.get_led_output()
-                actual_active = sum(1 for color in led_output if any(c > 0 for c in color))
-                logger.info(f"  Actual LED output: {len(led_output)} total, {actual_active} active")
+                actual_active = count_active_leds(led_output)
+                logger.debug(f"  Actual LED output: {len(led_output)} total, {actual_active} active")
             except Exception as e:
                 logger.error(f"  Error getting LED output: {e}")
         else:
@@ -521,14 +827,14 @@ class SceneManager:
                 "total_effects": 0,
                 "total_segments": 0,
                 "current_palette": None,
-                "current_fps": EngineSettings.ANIMATION.target_fps,
-                "available_scenes": list(self.scenes.keys()),
+                "current_fps": self._target_fps,
+                "available_scenes": self._scene_ids,
                 "pattern_transition_active": self.pattern_transition.is_active,
                 "transition_phase": self.pattern_transition.phase.value if self.pattern_transition.is_active else None
             }
             
-            if self.active_scene_id and self.active_scene_id in self.scenes:
-                active_scene = self.scenes[self.active_scene_id]
+            if self._active_scene is not None:
+                active_scene = self._active_scene
                 stats["total_effects"] = len(active_scene.effects)
                 stats["current_palette"] = active_scene.current_palette
                 
@@ -539,45 +845,57 @@ class SceneManager:
             return stats
     
     def get_current_scene_info(self) -> Dict[str, Any]:
+        snapshot = self._info_snapshot
+        if snapshot is not None:
+            return snapshot
+        
         with self._lock:
-            if not self.active_scene_id or self.active_scene_id not in self.scenes:
-                return {
-                    "scene_id": None,
-                    "effect_id": None,
-                    "palette_id": None,
-                    "total_scenes": len(self.scenes),
-                    "total_effects": 0,
-                    "total_segments": 0
-                }
-            
-            scene = self.scenes[self.active_scene_id]
-            current_effect = scene.get_current_effect()
-            
+            if self._info_snapshot is None:
+                self._info_snapshot = self._build_current_scene_info()
+            return self._info_snapshot
+    
+    def _build_current_scene_info(self) -> Dict[str, Any]:
+        if self._active_scene is None:
             return {
-                "scene_id": scene.scene_id,
-                "effect_id": scene.current_effect_id,
-                "palette_id": scene.current_palette,
+                "scene_id": None,
+                "effect_id": None,
+                "palette_id": None,
                 "total_scenes": len(self.scenes),
-                "total_effects": len(scene.effects),
-                "total_segments": len(current_effect.segments) if current_effect else 0,
-                "available_scenes": list(self.scenes.keys()),
-                "available_effects": list(scene.effects.keys()),
-                "available_palettes": list(scene.palettes.keys())
+                "total_effects": 0,
+                "total_segments": 0
             }
+        
+        scene = self._active_scene
+        current_effect = scene.get_current_effect()
+        
+        return {
+            "scene_id": scene.scene_id,
+            "effect_id": scene.current_effect_id,
+            "palette_id": scene.current_palette,
+            "total_scenes": len(self.scenes),
+            "total_effects": len(scene.effects),
+            "total_segments": len(current_effect.segments) if current_effect else 0,
+            "available_scenes": self._scene_ids,
+            "available_effects": scene.get_effect_ids(),
+            "available_palettes": scene.get_palette_ids()
+        }
     
     def get_all_scenes(self) -> Dict[int, str]:
+        snapshot = self._scenes_snapshot
+        if snapshot is not None:
+            return snapshot
+        
         with self._lock:
-            scenes_info = {}
-            for scene_id, scene in self.scenes.items():
-                scenes_info[scene_id] = f"Scene {scene_id}"
-            return scenes_info
+            if self._scenes_snapshot is None:
+                self._scenes_snapshot = {scene_id: f"Scene {scene_id}" for scene_id in self.scenes}
+            return self._scenes_snapshot
     
     def get_all_segments_data(self) -> List[Dict[str, Any]]:
         with self._lock:
             segments_data = []
             
-            if self.active_scene_id and self.active_scene_id in self.scenes:
-                scene = self.scenes[self.active_scene_id]
+            if self._active_scene is not None:
+                scene = self._active_scene
                 current_effect = scene.get_current_effect()
                 
                 if current_effect:
@@ -585,7 +903,7 @@ class SceneManager:
                         segments_data.append({
                             "id": segment.segment_id,
                             "position": segment.current_position,
-                            "length": sum(segment.length),
+                            "length": segment.total_length,
                             "speed": segment.move_speed,
                             "colors": segment.get_led_colors(scene.get_current_palette())
                         })
@@ -5,6 +5,8 @@ Effect model - Defines the Effect data structure.
 from typing import Dict, List, Any
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .segment import Segment
 
 
@@ -19,13 +21,13 @@ class Effect:
     fps: int = 60
     time: float = 0.0
     current_palette: str = "A"
-    segments: Dict[str, Segment] = field(default_factory=dict)
+    segments: Dict[int, Segment] = field(default_factory=dict)
     
     def add_segment(self, segment: Segment):
         """
         Add a segment to the effect.
         """
-        self.segments[str(segment.segment_id)] = segment
+        self.segments[int(segment.segment_id)] = segment
         
     def update_animation(self, delta_time: float):
         """
@@ -35,23 +37,24 @@ class Effect:
         for segment in self.segments.values():
             segment.update_position(delta_time)
             
-    def get_led_output(self, palette: List[List[int]]) -> List[List[int]]:
+    def get_led_output(self, palette: List[List[int]]) -> np.ndarray:
         """
-        Calculate the final LED output for this effect.
+        Calculate the final LED output for this effect as a new uint8 (led_count, 3) array.
         """
-        led_colors = [[0, 0, 0] for _ in range(self.led_count)]
+        out = np.zeros((self.led_count, 3), dtype=np.uint8)
         
         for segment in self.segments.values():
-            segment_colors = segment.get_led_colors(palette)
+            segment_colors = segment.get_led_array(palette)
+            
             start_pos = int(segment.current_position)
+            first = max(0, start_pos)
+            last = min(self.led_count, start_pos + len(segment_colors))
+            if first >= last:
+                continue
             
-            for i, color in enumerate(segment_colors):
-                led_index = start_pos + i
-                if 0 <= led_index < self.led_count:
-                    for j in range(3):
-                        led_colors[led_index][j] = max(led_colors[led_index][j], color[j])
+            np.maximum(out[first:last], segment_colors[first - start_pos:last - start_pos], out=out[first:last])
                         
-        return led_colors
+        return out
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -63,7 +66,7 @@ class Effect:
             "fps": self.fps,
             "time": self.time,
             "current_palette": self.current_palette,
-            "segments": {k: v.to_dict() for k, v in self.segments.items()}
+            "segments": {str(k): v.to_dict() for k, v in self.segments.items()}
         }
     
     @classmethod
@@ -81,7 +84,7 @@ class Effect:
         
         for seg_id, seg_data in data["segments"].items():
             segment = Segment.from_dict(seg_data)
-            effect.segments[seg_id] = segment
+            effect.segments[int(seg_id)] = segment
             
         return effect
     
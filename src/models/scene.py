@@ -2,13 +2,44 @@
 Scene model - Defines the Scene data structure.
 """
 
-from typing import Dict, List, Any, Optional
+import sys
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .effect import Effect
 
+_BLACK_FRAME = np.zeros((225, 3), dtype=np.uint8)
+_BLACK_FRAME.setflags(write=False)
+_FALLBACK_PALETTE = np.full((6, 3), 255, dtype=np.uint8)
+_FALLBACK_PALETTE.setflags(write=False)
+
+
+def _intern_id(value: Any) -> Any:
+    """
+    Intern string IDs so palette lookups compare by identity.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
 
-@dataclass 
+def _to_palette_array(colors: Any) -> Any:
+    """
+    Convert a list of RGB colors to a contiguous uint8 array, leaving ragged or out-of-range data as-is
+    so it renders and serializes exactly as loaded.
+    """
+    try:
+        array = np.asarray(colors, dtype=np.int64)
+    except (TypeError, ValueError):
+        return colors
+    
+    if array.ndim != 2 or (array.size and (array.min() < 0 or array.max() > 255)):
+        return colors
+    
+    return array.astype(np.uint8)
+
+
+@dataclass(slots=True)
 class Scene:
     """
     Scene model containing effects and palettes.
@@ -17,47 +48,88 @@ class Scene:
     scene_id: int
     current_effect_id: int = 1
     current_palette: str = "A"
-    palettes: Dict[str, List[List[int]]] = field(default_factory=dict)
-    effects: Dict[str, Effect] = field(default_factory=dict)
+    palettes: Dict[str, np.ndarray] = field(default_factory=dict)
+    effects: Dict[int, Effect] = field(default_factory=dict)
     fade_params: List[int] = field(default_factory=lambda: [100, 200, 100])
     
+    _effect_ids: Optional[Tuple[int, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _palette_ids: Optional[Tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
+    
     def add_effect(self, effect: Effect):
         """
         Add an effect to the scene.
         """
-        self.effects[str(effect.effect_id)] = effect
+        self.effects[int(effect.effect_id)] = effect
+        self._effect_ids = None
+        
+    def get_effect_ids(self) -> Tuple[int, ...]:
+        """
+        Get the effect IDs, cached until the effects change.
+        """
+        if self._effect_ids is None:
+            self._effect_ids = tuple(self.effects)
+        return self._effect_ids
+    
+    def get_palette_ids(self) -> Tuple[str, ...]:
+        """
+        Get the palette IDs, cached until the palettes change.
+        """
+        if self._palette_ids is None:
+            self._palette_ids = tuple(self.palettes)
+        return self._palette_ids
+    
+    def invalidate_id_cache(self):
+        """
+        Drop the cached effect/palette IDs after direct dict mutation.
+        """
+        self._effect_ids = None
+        self._palette_ids = None
         
     def get_current_effect(self) -> Optional[Effect]:
         """
         Get the currently active effect.
         """
-        return self.effects.get(str(self.current_effect_id))
+        return self.effects.get(self.current_effect_id)
+    
+    def invalidate_color_cache(self):
+        """
+        Drop every segment's cached LED colors, e.g. after a palette is edited in place.
+        """
+        for effect in self.effects.values():
+            for segment in effect.segments.values():
+                segment.invalidate_color_cache()
     
     def get_current_palette(self) -> List[List[int]]:
         """
         Get the currently active palette.
         """
-        return self.palettes.get(self.current_palette, [[255, 255, 255]] * 6)
+        return self.palettes.get(self.current_palette, _FALLBACK_PALETTE)
     
     def switch_effect(self, effect_id: int, palette: str = None):
         """
         Switch the effect and optionally the palette.
         """
-        if str(effect_id) in self.effects:
+        if effect_id in self.effects:
             self.current_effect_id = effect_id
             
         if palette and palette in self.palettes:
             self.current_palette = palette
             
-    def get_led_output(self) -> List[List[int]]:
+    def get_led_output(self) -> np.ndarray:
         """
         Get the final LED output for the current scene.
         """
-        current_effect = self.get_current_effect()
-        if current_effect:
-            palette = self.get_current_palette()
-            return current_effect.get_led_output(palette)
-        return [[0, 0, 0] for _ in range(225)]
+        return self.render(self.current_effect_id, self.current_palette)
+    
+    def render(self, effect_id: int, palette_id: str) -> np.ndarray:
+        """
+        Render the given effect and palette without changing the current selection.
+        """
+        effect = self.effects.get(effect_id)
+        if effect:
+            palette = self.palettes.get(palette_id, _FALLBACK_PALETTE)
+            return effect.get_led_output(palette)
+        return _BLACK_FRAME
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -67,8 +139,11 @@ class Scene:
             "scene_ID": self.scene_id,
             "current_effect_ID": self.current_effect_id,
             "current_palette": self.current_palette,
-            "palettes": self.palettes,
-            "effects": {k: v.to_dict() for k, v in self.effects.items()}
+            "palettes": {
+                k: v.tolist() if isinstance(v, np.ndarray) else v
+                for k, v in self.palettes.items()
+            },
+            "effects": {str(k): v.to_dict() for k, v in self.effects.items()}
         }
     
     @classmethod
@@ -79,14 +154,18 @@ class Scene:
         scene = cls(
             scene_id=data["scene_ID"],
             current_effect_id=data["current_effect_ID"],
-            current_palette=data["current_palette"],
-            palettes=data["palettes"]
+            current_palette=_intern_id(data["current_palette"]),
+            palettes={
+                _intern_id(palette_id): _to_palette_array(colors)
+                for palette_id, colors in data["palettes"].items()
+            }
         )
         
         for eff_id, eff_data in data["effects"].items():
             effect = Effect.from_dict(eff_data)
-            scene.effects[eff_id] = effect
+            scene.effects[int(eff_id)] = effect
             
+        scene.invalidate_id_cache()
         return scene
     
     def get_stats(self) -> Dict[str, Any]:
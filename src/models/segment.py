@@ -2,12 +2,34 @@
 Segment model - Accurate LED calculation for large arrays and variable lengths
 """
 
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional, Tuple, Callable
 from dataclasses import dataclass, field
+from operator import attrgetter
 import math
 
+import numpy as np
 
-@dataclass
+_NO_COLORS = np.zeros((0, 3), dtype=np.uint8)
+_NO_COLORS.setflags(write=False)
+_ZERO_RGB = (0, 0, 0)
+
+
+def _palette_rows(palette: Any) -> np.ndarray:
+    """
+    Convert a palette to float RGB rows, treating entries with fewer than three channels as black.
+    """
+    if isinstance(palette, np.ndarray) and palette.ndim == 2:
+        if palette.shape[1] < 3:
+            return np.zeros((len(palette), 3), dtype=np.float64)
+        return palette[:, :3].astype(np.float64)
+    
+    return np.array(
+        [entry[:3] if len(entry) >= 3 else [0, 0, 0] for entry in palette],
+        dtype=np.float64
+    ).reshape(-1, 3)
+
+
+@dataclass(slots=True)
 class Segment:
     """
     LED Segment model representing a moving light segment.
@@ -27,6 +49,19 @@ class Segment:
     gradient: bool = False
     fade: bool = False
     gradient_colors: List[int] = field(default_factory=lambda: [0, -1, -1])
+    _color: List[int] = field(init=False, repr=False, compare=False)
+    _transparency: List[float] = field(init=False, repr=False, compare=False)
+    _length: List[int] = field(init=False, repr=False, compare=False)
+    _dimmer_time: List[int] = field(init=False, repr=False, compare=False)
+    _gradient: bool = field(init=False, repr=False, compare=False)
+    _fade: bool = field(init=False, repr=False, compare=False)
+    _gradient_colors: List[int] = field(init=False, repr=False, compare=False)
+    total_length: int = field(default=0, init=False, repr=False, compare=False)
+    _part_lengths: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _lit_length: int = field(default=0, init=False, repr=False, compare=False)
+    _grad_start: float = field(default=1.0, init=False, repr=False, compare=False)
+    _grad_end: float = field(default=1.0, init=False, repr=False, compare=False)
+    _color_cache: Optional[Tuple[Any, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """
@@ -49,6 +84,43 @@ class Segment:
         
         while len(self.length) < len(self.color):
             self.length.append(1)
+        
+        self._refresh_length_metadata()
+        self._refresh_gradient_endpoints()
+    
+    def set_length(self, length: List[int]):
+        """
+        Replace the length array and refresh the cached length metadata
+        """
+        self.length = length
+    
+    def _refresh_length_metadata(self):
+        """
+        Recompute the totals and clipped part lengths derived from the length array
+        """
+        length = self._length
+        self.total_length = sum(length) if length else 0
+        self._part_lengths = np.maximum(np.asarray(length, dtype=np.int64).reshape(-1), 0)
+        self._lit_length = int(self._part_lengths.sum())
+    
+    def _refresh_gradient_endpoints(self):
+        """
+        Normalise the gradient endpoints once, mapping negative values to full brightness
+        """
+        gradient_colors = self._gradient_colors
+        if not gradient_colors or len(gradient_colors) < 2:
+            self._grad_start = self._grad_end = 1.0
+            return
+        
+        start, end = gradient_colors[0], gradient_colors[1]
+        self._grad_start = start / 100.0 if start >= 0 else 1.0
+        self._grad_end = end / 100.0 if end >= 0 else 1.0
+    
+    def invalidate_color_cache(self):
+        """
+        Drop the cached LED colors after an in-place edit of the segment lists or a palette change
+        """
+        self._color_cache = None
     
     def update_position(self, delta_time: float):
         """
@@ -75,186 +147,185 @@ class Segment:
                 relative_pos = (self.current_position - min_pos) % range_size
                 self.current_position = min_pos + relative_pos
                 
-    def get_led_colors(self, palette: List[List[int]]) -> List[List[int]]:
+    def get_led_array(self, palette: List[List[int]]) -> np.ndarray:
         """
-        Calculate LED colors for this segment
+        Get LED colors as a read-only uint8 (n, 3) array, cached until the palette object changes
         """
-        if not self.color or not palette:
-            return []
+        cache = self._color_cache
+        if cache is not None and cache[0] is palette:
+            return cache[1]
+        
+        array = self._compute_led_array(palette)
+        array.setflags(write=False)
         
-        colors = []
-        current_led_index = 0
+        self._color_cache = (palette, array)
+        return array
+    
+    def get_led_colors(self, palette: List[List[int]]) -> List[List[int]]:
+        """
+        Calculate LED colors for this segment as nested lists
+        """
+        return self.get_led_array(palette).tolist()
+    
+    def _compute_led_array(self, palette: List[List[int]]) -> np.ndarray:
+        """
+        Calculate LED colors for this segment as a uint8 (n, 3) array
+        """
+        color_ids = self.color
+        if not color_ids or palette is None or len(palette) == 0:
+            return _NO_COLORS
         
         try:
-            total_length = sum(max(0, length) for length in self.length)
+            total_length = self._lit_length
+            lengths = self._part_lengths
+            part_count = len(lengths)
+            color_count = len(color_ids)
+            fade = self.fade
+            gradient = self.gradient
             
             if total_length == 0:
-                for i in range(len(self.color)):
-                    if len(self.color) > len(self.length):
-                        colors.append(self._get_single_led_color(i, palette, 0))
-                return colors
-            
-            for part_index in range(len(self.length)):
-                part_length = max(0, self.length[part_index])
-                
-                if part_length == 0:
-                    continue
+                if color_count > part_count:
+                    return np.array(
+                        [self._get_single_led_color(i, palette, 0) for i in range(color_count)],
+                        dtype=np.uint8
+                    )
+                return _NO_COLORS
+            
+            base_colors = _palette_rows(palette)
+            
+            color_indices = np.zeros(part_count, dtype=np.float64)
+            known = min(part_count, color_count)
+            color_indices[:known] = color_ids[:known]
+            
+            transparency = self.transparency
+            alphas = np.ones(part_count, dtype=np.float64)
+            known = min(part_count, len(transparency))
+            alphas[:known] = transparency[:known]
+            
+            valid = (color_indices >= 0) & (color_indices < len(base_colors)) & (color_indices == np.floor(color_indices))
+            base = np.zeros((part_count, 3), dtype=np.float64)
+            base[valid] = base_colors[color_indices[valid].astype(np.int64)]
+            
+            alphas = np.clip(alphas, 0.0, 1.0)
+            
+            # One np.clip over the whole buffer replaces the per-channel max/min clamp;
+            # float64 keeps the int() truncation of the scalar formula bit-for-bit.
+            if not fade and not gradient:
+                part_colors = base * alphas[:, None]
+                np.clip(part_colors, 0.0, 255.0, out=part_colors)
+                colors = np.repeat(part_colors.astype(np.uint8), lengths, axis=0)
+            else:
+                brightness = np.ones(total_length, dtype=np.float64)
+                if fade:
+                    brightness = self._get_fade_brightness(np.arange(total_length, dtype=np.float64), total_length)
                 
-                color_index = self.color[part_index] if part_index < len(self.color) else 0
-                transparency = self.transparency[part_index] if part_index < len(self.transparency) else 1.0
+                if gradient:
+                    brightness = brightness * self._get_gradient_brightness(lengths)
                 
-                for led_in_part in range(part_length):
-                    led_color = self._calculate_led_color(
-                        color_index, transparency, current_led_index, 
-                        total_length, palette, part_index, led_in_part, part_length
-                    )
-                    colors.append(led_color)
-                    current_led_index += 1
+                scaled = np.repeat(base, lengths, axis=0) * np.repeat(alphas, lengths)[:, None]
+                scaled *= np.clip(brightness, 0.0, 1.0)[:, None]
+                colors = np.clip(scaled, 0.0, 255.0, out=scaled).astype(np.uint8)
             
-            if len(self.color) > len(self.length):
-                for extra_index in range(len(self.length), len(self.color)):
-                    led_color = self._get_single_led_color(extra_index, palette, current_led_index)
-                    colors.append(led_color)
-                    current_led_index += 1
+            if color_count > part_count:
+                extra = [
+                    self._get_single_led_color(extra_index, palette, total_length + offset)
+                    for offset, extra_index in enumerate(range(part_count, color_count))
+                ]
+                colors = np.vstack([colors, np.array(extra, dtype=np.uint8)])
             
             return colors
             
         except Exception as e:
             import sys
             print(f"Error in get_led_colors: {e}", file=sys.stderr, flush=True)
-            return [[0, 0, 0] for _ in range(max(1, sum(max(0, l) for l in self.length)))]
-    
-    def _calculate_led_color(self, color_index: int, transparency: float, 
-                           current_led_index: int, total_length: int, palette: List[List[int]],
-                           part_index: int, led_in_part: int, part_length: int) -> List[int]:
-        """
-        Calculate color for a single LED with all effects applied
-        """
-        try:
-            if not (0 <= color_index < len(palette)):
-                return [0, 0, 0]
-            
-            base_color = palette[color_index][:3] if len(palette[color_index]) >= 3 else [0, 0, 0]
-            
-            brightness = 1.0
-            if self.fade and total_length > 0:
-                brightness = self._get_brightness_at_position(current_led_index, total_length)
-            
-            if self.gradient and part_length > 1:
-                gradient_factor = led_in_part / (part_length - 1)
-                brightness *= self._apply_gradient(gradient_factor, part_index)
-            
-            final_transparency = max(0.0, min(1.0, transparency))
-            final_brightness = max(0.0, min(1.0, brightness))
-            
-            final_color = [
-                max(0, min(255, int(c * final_transparency * final_brightness)))
-                for c in base_color
-            ]
-            
-            return final_color
-            
-        except Exception:
-            return [0, 0, 0]
+            return np.zeros((max(1, self._lit_length), 3), dtype=np.uint8)
     
     def _get_single_led_color(self, color_index_in_array: int, palette: List[List[int]], led_position: int) -> List[int]:
         """
         Get color for single LED (extra colors beyond length array)
         """
-        try:
-            if color_index_in_array >= len(self.color):
-                return [0, 0, 0]
-            
-            color_index = self.color[color_index_in_array]
-            if not (0 <= color_index < len(palette)):
-                return [0, 0, 0]
-            
-            base_color = palette[color_index][:3] if len(palette[color_index]) >= 3 else [0, 0, 0]
-            
-            transparency = 1.0
-            if color_index_in_array < len(self.transparency):
-                transparency = self.transparency[color_index_in_array]
-            
-            brightness = 1.0
-            if self.fade:
-                brightness = self._get_brightness_at_position(led_position, max(1, led_position + 1))
-            
-            final_transparency = max(0.0, min(1.0, transparency))
-            final_brightness = max(0.0, min(1.0, brightness))
-            
-            final_color = [
-                max(0, min(255, int(c * final_transparency * final_brightness)))
-                for c in base_color
-            ]
-            
-            return final_color
-            
-        except Exception:
-            return [0, 0, 0]
+        if color_index_in_array >= len(self.color):
+            return _ZERO_RGB
+        
+        color_index = self.color[color_index_in_array]
+        if not isinstance(color_index, int) or not (0 <= color_index < len(palette)):
+            return _ZERO_RGB
+        
+        entry = palette[color_index]
+        if len(entry) < 3:
+            return _ZERO_RGB
+        
+        transparency = 1.0
+        if color_index_in_array < len(self.transparency):
+            transparency = self.transparency[color_index_in_array]
+        
+        brightness = 1.0
+        if self.fade:
+            brightness = self._get_brightness_at_position(led_position, max(1, led_position + 1))
+        
+        final_transparency = max(0.0, min(1.0, transparency))
+        final_brightness = max(0.0, min(1.0, brightness))
+        
+        return [
+            max(0, min(255, int(entry[channel] * final_transparency * final_brightness)))
+            for channel in range(3)
+        ]
     
     def _get_brightness_at_position(self, relative_pos: int, total_length: int) -> float:
         """
-        Calculate brightness at relative position - OPTIMIZED
+        Calculate brightness at a single relative position
         """
-        try:
-            if not self.fade or not self.dimmer_time or total_length <= 0:
-                return 1.0
-            
-            dimmer_length = len(self.dimmer_time)
-            if dimmer_length <= 1:
-                return self.dimmer_time[0] / 100.0 if self.dimmer_time else 1.0
-            
-            progress = min(1.0, max(0.0, relative_pos / total_length))
-            dimmer_pos = progress * (dimmer_length - 1)
-            
-            index = int(dimmer_pos)
-            fraction = dimmer_pos - index
-            
-            if index >= dimmer_length - 1:
-                return max(0.0, min(1.0, self.dimmer_time[-1] / 100.0))
-            
-            current_value = self.dimmer_time[index]
-            next_value = self.dimmer_time[index + 1]
-            
-            interpolated = current_value + (next_value - current_value) * fraction
-            return max(0.0, min(1.0, interpolated / 100.0))
-            
-        except Exception:
-            return 1.0
+        return float(self._get_fade_brightness(np.array([relative_pos], dtype=np.float64), total_length)[0])
     
-    def _apply_gradient(self, gradient_factor: float, part_index: int) -> float:
+    def _get_fade_brightness(self, positions: np.ndarray, total_length: int) -> np.ndarray:
         """
-        Apply gradient effect
+        Interpolate the dimmer curve at the given relative positions in one np.interp call
         """
-        try:
-            if not self.gradient or not self.gradient_colors:
-                return 1.0
-            
-            if len(self.gradient_colors) < 2:
-                return 1.0
-            
-            start_brightness = self.gradient_colors[0] / 100.0 if self.gradient_colors[0] >= 0 else 1.0
-            end_brightness = self.gradient_colors[1] / 100.0 if self.gradient_colors[1] >= 0 else 1.0
-            
-            brightness = start_brightness + (end_brightness - start_brightness) * gradient_factor
-            return max(0.0, min(1.0, brightness))
-            
-        except Exception:
-            return 1.0
+        if not self.fade or not self.dimmer_time or total_length <= 0:
+            return np.ones(len(positions), dtype=np.float64)
+        
+        dimmer_length = len(self.dimmer_time)
+        if dimmer_length <= 1:
+            return np.full(len(positions), self.dimmer_time[0] / 100.0, dtype=np.float64)
+        
+        progress = np.clip(positions / total_length, 0.0, 1.0)
+        dimmer_values = np.asarray(self.dimmer_time, dtype=np.float64)
+        interpolated = np.interp(progress * (dimmer_length - 1), np.arange(dimmer_length), dimmer_values)
+        return np.clip(interpolated / 100.0, 0.0, 1.0)
+    
+    def _get_gradient_brightness(self, lengths: np.ndarray) -> np.ndarray:
+        """
+        Build the per-part gradient ramps for all LEDs at once
+        """
+        ramps = []
+        for part_length in lengths.tolist():
+            if part_length > 1:
+                ramps.append(self._get_gradient_ramp(part_length))
+            elif part_length == 1:
+                ramps.append(np.ones(1, dtype=np.float64))
+        
+        if not ramps:
+            return np.ones(0, dtype=np.float64)
+        return np.concatenate(ramps)
+    
+    def _get_gradient_ramp(self, part_length: int) -> np.ndarray:
+        """
+        Linear ramp between the gradient endpoints across one part
+        """
+        start = self._grad_start
+        end = self._grad_end
+        if start == end == 1.0:
+            return np.ones(part_length, dtype=np.float64)
+        
+        # start + (end - start) * t rather than np.linspace, which rounds differently in the last bit.
+        factors = np.arange(part_length, dtype=np.float64) / (part_length - 1)
+        return np.clip(start + (end - start) * factors, 0.0, 1.0)
     
     def get_total_led_count(self) -> int:
         """
         Get total number of LEDs this segment will generate
         """
-        try:
-            total = sum(max(0, length) for length in self.length)
-            
-            if len(self.color) > len(self.length):
-                total += len(self.color) - len(self.length)
-            
-            return max(0, total)
-        except Exception:
-            return 0
+        return self._lit_length + max(0, len(self.color) - len(self._part_lengths))
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -285,19 +356,19 @@ class Segment:
         try:
             segment = cls(
                 segment_id=data.get("segment_ID", 0),
-                color=data.get("color", [0]),
-                transparency=data.get("transparency", [1.0]),
-                length=data.get("length", [1]),
+                color=data["color"] if "color" in data else [0],
+                transparency=data["transparency"] if "transparency" in data else [1.0],
+                length=data["length"] if "length" in data else [1],
                 move_speed=data.get("move_speed", 0.0),
-                move_range=data.get("move_range", [0, 224]),
+                move_range=data["move_range"] if "move_range" in data else [0, 224],
                 initial_position=data.get("initial_position", 0),
                 current_position=data.get("current_position", 0.0),
                 is_edge_reflect=data.get("is_edge_reflect", True),
-                dimmer_time=data.get("dimmer_time", [0, 100, 200, 100, 0]),
+                dimmer_time=data["dimmer_time"] if "dimmer_time" in data else [0, 100, 200, 100, 0],
                 dimmer_time_ratio=data.get("dimmer_time_ratio", 1.0),
                 gradient=data.get("gradient", False),
                 fade=data.get("fade", False),
-                gradient_colors=data.get("gradient_colors", [0, -1, -1])
+                gradient_colors=data["gradient_colors"] if "gradient_colors" in data else [0, -1, -1]
             )
             
             if segment.current_position == 0.0:
@@ -322,7 +393,7 @@ class Segment:
         """
         try:
             return (any(c > 0 for c in self.color) and 
-                    sum(max(0, length) for length in self.length) > 0 and
+                    self._lit_length > 0 and
                     any(t > 0 for t in self.transparency))
         except Exception:
             return False
@@ -353,4 +424,28 @@ class Segment:
             return True
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+def _cache_input_property(slot: str, refresh: Optional[Callable[[Segment], None]] = None) -> property:
+    """
+    Property over a private slot that refreshes derived data and drops the cached LED colors on assignment
+    """
+    def setter(segment: Segment, value: Any):
+        setattr(segment, slot, value)
+        if refresh is not None:
+            refresh(segment)
+        segment._color_cache = None
+    
+    return property(attrgetter(slot), setter)
+
+
+# The dataclass machinery owns the field names, so the properties are attached to the built
+# class; position and speed stay plain slots because update_position writes them every frame.
+Segment.color = _cache_input_property("_color")
+Segment.transparency = _cache_input_property("_transparency")
+Segment.length = _cache_input_property("_length", Segment._refresh_length_metadata)
+Segment.dimmer_time = _cache_input_property("_dimmer_time")
+Segment.gradient = _cache_input_property("_gradient")
+Segment.fade = _cache_input_property("_fade")
+Segment.gradient_colors = _cache_input_property("_gradient_colors", Segment._refresh_gradient_endpoints)
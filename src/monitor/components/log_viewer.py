@@ -5,11 +5,27 @@ Log Viewer component for realtime log viewing with logger callback support
 import flet as ft
 import logging
 import threading
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 from collections import deque
 
 from config.theme import ThemeColors, ThemeStyles
-from src.utils.logger import set_ui_mode
+from src.utils.logger import set_ui_mode, flush_ui_logs
+
+_FILTER_DEBOUNCE_SECONDS = 0.2
+_UI_UPDATE_INTERVAL = 0.1
+_MAX_LOG_ENTRIES = 1000
+_MAX_DISPLAYED_ROWS = 100
+_LEVEL_COLORS = {
+    "INFO": ThemeColors.INFO,
+    "WARNING": ThemeColors.WARNING,
+    "ERROR": ThemeColors.ERROR
+}
+_LEVEL_PRIORITY = {
+    "INFO": 1,
+    "WARNING": 2,
+    "ERROR": 3
+}
 
 
 class LogEntry:
@@ -19,6 +35,7 @@ class LogEntry:
     def __init__(self, level: str, message: str, timestamp: str):
         self.level = level
         self.message = message
+        self.message_lower = message.lower()
         self.timestamp = timestamp
 
 
@@ -32,7 +49,11 @@ class LogViewer(ft.Container):
         
         self._lock = threading.Lock()
         
-        self.log_entries: deque = deque(maxlen=1000)
+        self.log_entries: deque = deque(maxlen=_MAX_LOG_ENTRIES)
+        # Ordered subsets of log_entries, trimmed as entries fall out of it.
+        self._entries_by_level: Dict[str, deque] = {level: deque() for level in ("WARNING", "ERROR")}
+        self._new_entries: deque = deque(maxlen=_MAX_LOG_ENTRIES)
+        self._row_pool: List[ft.Container] = []
         self.log_display = ft.ListView(
             auto_scroll=True,
             spacing=2,
@@ -42,8 +63,11 @@ class LogViewer(ft.Container):
         
         self.filter_level = "ALL"
         self.filter_text = ""
+        self._filter_text_lower = ""
         self.page = None
         self.needs_update = False
+        self._debounce_timer: Optional[threading.Timer] = None
+        self._last_ui_update = 0.0
         
         self._build_ui()
     
@@ -135,8 +159,19 @@ class LogViewer(ft.Container):
         """
         Add new log entry
         """
+        priority = _LEVEL_PRIORITY.get(entry.level, 1)
+        
         with self._lock:
-            self.log_entries.append(entry)
+            log_entries = self.log_entries
+            evicted = log_entries[0] if len(log_entries) == log_entries.maxlen else None
+            log_entries.append(entry)
+            
+            for level, bucket in self._entries_by_level.items():
+                if evicted is not None and bucket and bucket[0] is evicted:
+                    bucket.popleft()
+                if priority >= _LEVEL_PRIORITY[level]:
+                    bucket.append(entry)
+            self._new_entries.append(entry)
             self.needs_update = True
     
     def _update_display_sync(self):
@@ -144,8 +179,11 @@ class LogViewer(ft.Container):
         Update display synchronously
         """
         try:
-            filtered_entries = self._filter_logs()
-            self._rebuild_log_display(filtered_entries)
+            with self._lock:
+                filtered_entries = self._filter_logs()
+                self._rebuild_log_display(filtered_entries)
+                self._new_entries.clear()
+                self.needs_update = False
             
             if self.page:
                 try:
@@ -161,117 +199,174 @@ class LogViewer(ft.Container):
         Update log display
         """
         try:
+            now = time.monotonic()
+            if now - self._last_ui_update < _UI_UPDATE_INTERVAL:
+                return
+            
+            flush_ui_logs()
+            
             with self._lock:
                 if not self.needs_update:
                     return
-                    
-                filtered_entries = self._filter_logs()
-                self._rebuild_log_display(filtered_entries)
+                
+                self._append_log_rows(self._new_entries)
+                self._new_entries.clear()
                 self.needs_update = False
+                self._last_ui_update = now
                 
         except Exception as e:
             print(f"[LOG VIEWER UPDATE] Error: {e}", flush=True)
     
-    def _filter_logs(self) -> List[LogEntry]:
+    def _matches_filter(self, entry: LogEntry) -> bool:
         """
-        Filter logs based on filter criteria
+        Check an entry against the current level and text filters
         """
-        filtered = []
+        if self.filter_level != "ALL":
+            min_priority = _LEVEL_PRIORITY.get(self.filter_level, 1)
+            if _LEVEL_PRIORITY.get(entry.level, 1) < min_priority:
+                return False
         
-        level_priority = {
-            "INFO": 1,
-            "WARNING": 2,
-            "ERROR": 3
-        }
+        if self._filter_text_lower and self._filter_text_lower not in entry.message_lower:
+            return False
         
-        if self.filter_level == "ALL":
-            min_priority = -1  
-        else:
-            min_priority = level_priority.get(self.filter_level, 1)
+        return True
+    
+    def _filter_logs(self) -> List[LogEntry]:
+        """
+        Filter logs based on filter criteria
+        """
+        entries = self._entries_by_level.get(self.filter_level, self.log_entries)
         
-        for entry in self.log_entries:
-            entry_priority = level_priority.get(entry.level, 1)
-            
-            if self.filter_level != "ALL" and entry_priority < min_priority:
-                continue
-                
-            if self.filter_text and self.filter_text.lower() not in entry.message.lower():
+        filtered = []
+        for entry in reversed(entries):
+            if not self._matches_filter(entry):
                 continue
-                
             filtered.append(entry)
+            if len(filtered) == _MAX_DISPLAYED_ROWS:
+                break
         
-        return filtered[-100:]
+        filtered.reverse()
+        return filtered
     
     def _rebuild_log_display(self, entries: List[LogEntry]):
         """
         Rebuild log display with new entries
         """
-        self.log_display.controls.clear()
+        controls = self.log_display.controls
+        self._release_log_rows(controls)
+        controls.clear()
         
         for entry in entries:
-            log_row = self._create_log_row(entry)
-            self.log_display.controls.append(log_row)
+            controls.append(self._acquire_log_row(entry))
+    
+    def _append_log_rows(self, entries):
+        """
+        Append rows for newly arrived entries and drop the oldest rows past the display limit
+        """
+        matching = [entry for entry in entries if self._matches_filter(entry)]
+        if not matching:
+            return
+        
+        controls = self.log_display.controls
+        for entry in matching[-_MAX_DISPLAYED_ROWS:]:
+            controls.append(self._acquire_log_row(entry))
+        
+        overflow = len(controls) - _MAX_DISPLAYED_ROWS
+        if overflow > 0:
+            self._release_log_rows(controls[:overflow])
+            del controls[:overflow]
+    
+    def _acquire_log_row(self, entry: LogEntry) -> ft.Container:
+        """
+        Take a row from the pool, or build one, and fill it with the entry
+        """
+        if self._row_pool:
+            row = self._row_pool.pop()
+            self._fill_log_row(row, entry)
+            return row
+        return self._create_log_row(entry)
+    
+    def _release_log_rows(self, rows: List[ft.Container]):
+        """
+        Return rows that left the display to the pool, up to one screenful
+        """
+        free_slots = _MAX_DISPLAYED_ROWS - len(self._row_pool)
+        if free_slots > 0:
+            self._row_pool.extend(rows[:free_slots])
     
     def _create_log_row(self, entry: LogEntry) -> ft.Container:
         """
         Create row for a log entry
         """
-        level_colors = {
-            "INFO": ThemeColors.INFO,
-            "WARNING": ThemeColors.WARNING,
-            "ERROR": ThemeColors.ERROR
-        }
-        
-        level_color = level_colors.get(entry.level, ThemeColors.TEXT_PRIMARY)
+        timestamp_text = ft.Text(
+            size=10,
+            color=ThemeColors.TEXT_DISABLED,
+            width=60
+        )
+        level_text = ft.Text(
+            size=10,
+            width=70,
+            weight=ft.FontWeight.BOLD
+        )
+        message_text = ft.Text(
+            size=11,
+            color=ThemeColors.TEXT_PRIMARY,
+            expand=True,
+            no_wrap=False,
+            overflow=ft.TextOverflow.VISIBLE
+        )
         
-        return ft.Container(
+        row = ft.Container(
             content=ft.Column([
                 ft.Row([
-                    ft.Text(
-                        entry.timestamp,
-                        size=10,
-                        color=ThemeColors.TEXT_DISABLED,
-                        width=60
-                    ),
-                    ft.Text(
-                        entry.level,
-                        size=10,
-                        color=level_color,
-                        width=70,
-                        weight=ft.FontWeight.BOLD
-                    ),
-                    ft.Text(
-                        entry.message,
-                        size=11,
-                        color=ThemeColors.TEXT_PRIMARY,
-                        expand=True,
-                        no_wrap=False,
-                        overflow=ft.TextOverflow.VISIBLE
-                    )
+                    timestamp_text,
+                    level_text,
+                    message_text
                 ], spacing=8, alignment=ft.MainAxisAlignment.START)
             ], spacing=0, tight=True),
             padding=ft.padding.symmetric(horizontal=8, vertical=2),
-            bgcolor=ThemeColors.SURFACE_VARIANT if entry.level == "ERROR" else None,
-            border_radius=4
+            border_radius=4,
+            data=(timestamp_text, level_text, message_text)
         )
+        self._fill_log_row(row, entry)
+        return row
+    
+    def _fill_log_row(self, row: ft.Container, entry: LogEntry):
+        """
+        Write an entry's values into an existing row
+        """
+        timestamp_text, level_text, message_text = row.data
+        timestamp_text.value = entry.timestamp
+        level_text.value = entry.level
+        level_text.color = _LEVEL_COLORS.get(entry.level, ThemeColors.TEXT_PRIMARY)
+        message_text.value = entry.message
+        row.bgcolor = ThemeColors.SURFACE_VARIANT if entry.level == "ERROR" else None
     
     def _on_filter_change(self, e):
         """
         Handle filter level change
         """
         self.filter_level = e.control.value
-        with self._lock:
-            self.needs_update = True
-        self._update_display_sync()
+        self._schedule_display_update()
     
     def _on_search_change(self, e):
         """
         Handle search text change
         """
         self.filter_text = e.control.value
-        with self._lock:
-            self.needs_update = True
-        self._update_display_sync()
+        self._filter_text_lower = (self.filter_text or "").lower()
+        self._schedule_display_update()
+    
+    def _schedule_display_update(self):
+        """
+        Rebuild the display once filter input has been idle for the debounce interval
+        """
+        if self._debounce_timer is not None:
+            self._debounce_timer.cancel()
+        
+        self._debounce_timer = threading.Timer(_FILTER_DEBOUNCE_SECONDS, self._update_display_sync)
+        self._debounce_timer.daemon = True
+        self._debounce_timer.start()
     
     def _on_clear_logs(self, e):
         """
@@ -279,6 +374,9 @@ class LogViewer(ft.Container):
         """
         with self._lock:
             self.log_entries.clear()
+            for bucket in self._entries_by_level.values():
+                bucket.clear()
+            self._new_entries.clear()
+            self._release_log_rows(self.log_display.controls)
             self.log_display.controls.clear()
-            self.needs_update = True
         self._update_display_sync()
\ No newline at end of file
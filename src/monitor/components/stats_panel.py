@@ -4,6 +4,7 @@ Stats Panel - Complete fix with correct data sources
 
 import flet as ft
 from config.theme import ThemeColors, ThemeStyles
+from src.core.scene_manager import count_active_leds
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -88,7 +89,7 @@ class StatsPanel(ft.Container):
             stats = self.engine.get_stats()
             
             led_colors = self.engine.get_led_colors()
-            actual_active_leds = sum(1 for color in led_colors if any(c > 0 for c in color[:3]))
+            actual_active_leds = count_active_leds(led_colors)
             
             total_scenes = len(self.engine.scene_manager.scenes)
             
@@ -5,6 +5,7 @@ Logging system with headless and UI modes
 import logging
 import sys
 import os
+from collections import deque
 from pathlib import Path
 from typing import Optional, Callable
 from logging.handlers import RotatingFileHandler
@@ -15,6 +16,8 @@ from config.settings import EngineSettings
 
 colorama.init(autoreset=True)
 
+_pending_ui_records: deque = deque(maxlen=1000)
+
 
 class LoggerMode:
     """
@@ -89,14 +92,34 @@ class UILogHandler(logging.Handler):
     
     def emit(self, record):
         """
-        Send log record to UI
+        Format the record now and queue only its strings for the UI
         """
         try:
-            ui_callback = LoggerMode.get_ui_callback()
-            if ui_callback and not LoggerMode.is_headless():
+            if LoggerMode.get_ui_callback() and not LoggerMode.is_headless():
                 msg = self.format(record)
                 timestamp = self.formatter.formatTime(record, '%H:%M:%S') if self.formatter else ''
-                ui_callback(record.levelname, msg, timestamp)
+                _pending_ui_records.append((record.levelname, msg, timestamp))
+        except Exception:
+            pass
+
+
+def flush_ui_logs():
+    """
+    Pass queued UI log entries to the UI callback
+    """
+    ui_callback = LoggerMode.get_ui_callback()
+    
+    while _pending_ui_records:
+        try:
+            levelname, msg, timestamp = _pending_ui_records.popleft()
+        except IndexError:
+            break
+        
+        if not ui_callback:
+            continue
+        
+        try:
+            ui_callback(levelname, msg, timestamp)
         except Exception:
             pass
 
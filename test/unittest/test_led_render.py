@@ -0,0 +1,192 @@
+"""
+Test cases for the vectorized LED render path
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.models.effect import Effect
+from src.models.segment import Segment
+
+
+PALETTE = [
+    [0, 0, 0],
+    [255, 0, 0],
+    [0, 255, 0],
+    [0, 0, 255],
+    [255, 255, 255],
+    [37, 180, 91],
+]
+
+
+def _fade_brightness(segment, relative_pos, total_length):
+    """Per-LED dimmer interpolation, as the original scalar code did it"""
+    if not segment.fade or not segment.dimmer_time or total_length <= 0:
+        return 1.0
+
+    dimmer_length = len(segment.dimmer_time)
+    if dimmer_length <= 1:
+        return segment.dimmer_time[0] / 100.0
+
+    progress = min(1.0, max(0.0, relative_pos / total_length))
+    dimmer_pos = progress * (dimmer_length - 1)
+    index = int(dimmer_pos)
+    fraction = dimmer_pos - index
+
+    if index >= dimmer_length - 1:
+        return max(0.0, min(1.0, segment.dimmer_time[-1] / 100.0))
+
+    current_value = segment.dimmer_time[index]
+    next_value = segment.dimmer_time[index + 1]
+    interpolated = current_value + (next_value - current_value) * fraction
+    return max(0.0, min(1.0, interpolated / 100.0))
+
+
+def _gradient_brightness(segment, factor):
+    """Per-LED gradient ramp, as the original scalar code did it"""
+    if not segment.gradient or len(segment.gradient_colors) < 2:
+        return 1.0
+
+    start = segment.gradient_colors[0] / 100.0 if segment.gradient_colors[0] >= 0 else 1.0
+    end = segment.gradient_colors[1] / 100.0 if segment.gradient_colors[1] >= 0 else 1.0
+    return max(0.0, min(1.0, start + (end - start) * factor))
+
+
+def _shade(palette, color_index, transparency, brightness):
+    if not (0 <= color_index < len(palette)):
+        return [0, 0, 0]
+
+    transparency = max(0.0, min(1.0, transparency))
+    brightness = max(0.0, min(1.0, brightness))
+    return [max(0, min(255, int(c * transparency * brightness))) for c in palette[color_index][:3]]
+
+
+def reference_segment_colors(segment, palette):
+    """Reference per-LED implementation of Segment colors"""
+    colors = []
+    total_length = sum(max(0, length) for length in segment.length)
+    led_index = 0
+
+    if total_length > 0:
+        for part_index, part_length in enumerate(segment.length):
+            part_length = max(0, part_length)
+            color_index = segment.color[part_index] if part_index < len(segment.color) else 0
+            transparency = segment.transparency[part_index] if part_index < len(segment.transparency) else 1.0
+
+            for led_in_part in range(part_length):
+                brightness = _fade_brightness(segment, led_index, total_length)
+                if segment.gradient and part_length > 1:
+                    brightness *= _gradient_brightness(segment, led_in_part / (part_length - 1))
+                colors.append(_shade(palette, color_index, transparency, brightness))
+                led_index += 1
+
+    for extra_index in range(len(segment.length), len(segment.color)):
+        brightness = _fade_brightness(segment, led_index, max(1, led_index + 1))
+        colors.append(_shade(palette, segment.color[extra_index], segment.transparency[extra_index], brightness))
+        led_index += 1
+
+    return colors
+
+
+def reference_effect_output(effect, palette):
+    """Reference per-LED implementation of Effect output (max-composite, clipped to the strip)"""
+    output = [[0, 0, 0] for _ in range(effect.led_count)]
+
+    for segment in effect.segments.values():
+        start_pos = int(segment.current_position)
+        for i, color in enumerate(reference_segment_colors(segment, palette)):
+            led_index = start_pos + i
+            if 0 <= led_index < effect.led_count:
+                output[led_index] = [max(a, b) for a, b in zip(output[led_index], color)]
+
+    return output
+
+
+def make_segment(segment_id, position, length, **kwargs):
+    return Segment(
+        segment_id=segment_id,
+        color=kwargs.pop("color", [1, 2, 3, 4][:len(length)]),
+        transparency=kwargs.pop("transparency", [1.0] * len(length)),
+        length=length,
+        current_position=position,
+        **kwargs
+    )
+
+
+class TestLedRender:
+    """Compare the vectorized render path with the per-LED reference"""
+
+    @pytest.fixture
+    def palette(self):
+        """Palette as the scenes store it"""
+        return np.array(PALETTE, dtype=np.uint8)
+
+    def assert_matches_reference(self, effect, palette):
+        output = effect.get_led_output(palette)
+        assert output.shape == (effect.led_count, 3)
+        assert output.dtype == np.uint8
+        assert output.tolist() == reference_effect_output(effect, PALETTE)
+
+    def test_segment_colors_match_reference(self, palette):
+        """Segment._compute_led_array with fade, gradient and extra colors"""
+        segment = make_segment(1, 0, [4, 0, 7], color=[1, 2, 5, 3, 4], transparency=[0.5, 1.0, 0.8, 0.3, 1.2],
+                               fade=True, gradient=True, gradient_colors=[20, 90, 0],
+                               dimmer_time=[0, 100, 40, 100, 0])
+
+        assert segment._compute_led_array(palette).tolist() == reference_segment_colors(segment, PALETTE)
+
+    def test_negative_position(self, palette):
+        """A segment starting before LED 0 is clipped on the left"""
+        effect = Effect(effect_id=1, led_count=20)
+        effect.add_segment(make_segment(1, -3.7, [2, 3, 4], fade=True))
+
+        self.assert_matches_reference(effect, palette)
+
+    def test_segment_past_led_count(self, palette):
+        """A segment running past the end of the strip is clipped on the right"""
+        effect = Effect(effect_id=1, led_count=20)
+        effect.add_segment(make_segment(1, 15.2, [3, 3, 3], gradient=True, gradient_colors=[100, 10, 0]))
+        effect.add_segment(make_segment(2, 25, [2, 2]))
+
+        self.assert_matches_reference(effect, palette)
+
+    def test_overlapping_segments(self, palette):
+        """Overlapping segments are combined channel-wise with max"""
+        effect = Effect(effect_id=1, led_count=30)
+        effect.add_segment(make_segment(1, 2, [5, 5], color=[1, 5], transparency=[0.6, 1.0]))
+        effect.add_segment(make_segment(2, 6, [4, 6], color=[2, 4], transparency=[1.0, 0.4], fade=True))
+        effect.add_segment(make_segment(3, 8.9, [10], color=[3], gradient=True, gradient_colors=[0, 100, 0]))
+
+        self.assert_matches_reference(effect, palette)
+
+    def test_random_effects_match_reference(self, palette):
+        """Randomized segments"""
+        rng = random.Random(1234)
+
+        for _ in range(200):
+            led_count = rng.randint(1, 60)
+            effect = Effect(effect_id=1, led_count=led_count)
+
+            for segment_id in range(rng.randint(1, 4)):
+                parts = rng.randint(1, 4)
+                colors = [rng.randint(-1, len(PALETTE)) for _ in range(parts + rng.randint(0, 2))]
+                effect.add_segment(Segment(
+                    segment_id=segment_id,
+                    color=colors,
+                    transparency=[round(rng.uniform(-0.2, 1.2), 2) for _ in colors],
+                    length=[rng.randint(-2, 12) for _ in range(parts)],
+                    current_position=rng.uniform(-15, led_count + 5),
+                    fade=rng.random() < 0.5,
+                    gradient=rng.random() < 0.5,
+                    gradient_colors=[rng.randint(-1, 100), rng.randint(-1, 100), 0],
+                    dimmer_time=[rng.randint(0, 100) for _ in range(rng.randint(1, 6))],
+                ))
+
+            output = effect.get_led_output(palette)
+            assert output.tolist() == reference_effect_output(effect, PALETTE)